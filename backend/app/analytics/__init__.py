@@ -0,0 +1 @@
+# Swipe event log and rollups
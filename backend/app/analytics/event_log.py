@@ -0,0 +1,97 @@
+"""In-process buffer for swipe_events, flushed to Postgres with COPY.
+
+record_event() only appends to a list under a lock, so the swipe path pays no DB
+round trip; a background task (see app.main lifespan) flushes every few seconds.
+"""
+
+import asyncio
+import csv
+import io
+import logging
+import threading
+from datetime import datetime
+from uuid import UUID
+
+from app.config import get_settings
+from app.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+COPY_SQL = (
+    "COPY swipe_events (user_id, track_id, event_type, from_state, occurred_at) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+FLUSH_BATCH_SIZE = 500  # flush early when this many events are waiting
+
+_lock = threading.Lock()
+_buffer: list[tuple] = []
+_flush_lock = threading.Lock()  # one COPY at a time
+
+
+def record_event(
+    user_id: UUID,
+    track_id: UUID,
+    event_type: str,
+    from_state: str | None = None,
+    occurred_at: datetime | None = None,
+) -> None:
+    """Queue one event (synced | kept | removed) for the next COPY."""
+    event = (user_id, track_id, event_type, from_state, occurred_at or datetime.now())
+    with _lock:
+        _buffer.append(event)
+        overflow = len(_buffer) - get_settings().event_buffer_max
+        if overflow > 0:
+            # DB unreachable for a while: drop oldest rather than grow without bound
+            del _buffer[:overflow]
+            logger.warning("swipe event buffer full; dropped %d events", overflow)
+
+
+def pending_count() -> int:
+    with _lock:
+        return len(_buffer)
+
+
+def _to_csv(events: list[tuple]) -> io.StringIO:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for user_id, track_id, event_type, from_state, occurred_at in events:
+        writer.writerow((user_id, track_id, event_type, from_state or "", occurred_at.isoformat()))
+    buf.seek(0)
+    return buf
+
+
+def flush() -> int:
+    """COPY all buffered events in one transaction; on failure re-queue them. Returns rows written."""
+    with _flush_lock:
+        with _lock:
+            events = _buffer[:]
+            _buffer.clear()
+        if not events:
+            return 0
+        conn = get_engine().raw_connection()
+        try:
+            with conn.cursor() as cur:
+                # from_state "" → NULL (csv NULL default is unquoted empty string)
+                cur.copy_expert(COPY_SQL, _to_csv(events))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            with _lock:
+                _buffer[:0] = events
+            logger.exception("swipe event flush failed; %d events re-queued", len(events))
+            return 0
+        finally:
+            conn.close()
+        return len(events)
+
+
+async def run_flusher(interval: float) -> None:
+    """Flush every interval seconds (or sooner once FLUSH_BATCH_SIZE events are waiting)."""
+    waited = 0.0
+    tick = min(interval, 0.5)
+    while True:
+        await asyncio.sleep(tick)
+        waited += tick
+        if waited >= interval or pending_count() >= FLUSH_BATCH_SIZE:
+            waited = 0.0
+            await asyncio.to_thread(flush)
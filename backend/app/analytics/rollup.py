@@ -0,0 +1,120 @@
+"""Daily rollup of swipe_events into swipe_event_daily, plus monthly partition upkeep.
+
+Run from backend/ (e.g. cron / Railway scheduled job):
+    python -m app.analytics.rollup            # yesterday and today
+    python -m app.analytics.rollup --days 30  # backfill last 30 days
+"""
+
+import argparse
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from app.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Gaps longer than this are breaks, not decision time
+MAX_DECISION_GAP_SECONDS = 600
+
+ROLLUP_SQL = text(f"""
+WITH ev AS (
+    SELECT
+        user_id,
+        event_type,
+        occurred_at,
+        EXTRACT(EPOCH FROM occurred_at - LAG(occurred_at) OVER (
+            PARTITION BY user_id, (event_type = 'synced') ORDER BY occurred_at
+        )) AS gap_seconds
+    FROM swipe_events
+    WHERE occurred_at >= :start AND occurred_at < :end
+)
+INSERT INTO swipe_event_daily (day, user_id, event_type, event_count, avg_decision_seconds)
+SELECT
+    occurred_at::date,
+    user_id,
+    event_type,
+    COUNT(*),
+    AVG(gap_seconds) FILTER (
+        WHERE event_type <> 'synced' AND gap_seconds <= {MAX_DECISION_GAP_SECONDS}
+    )
+FROM ev
+GROUP BY occurred_at::date, user_id, event_type
+ON CONFLICT (day, user_id, event_type) DO UPDATE SET
+    event_count = EXCLUDED.event_count,
+    avg_decision_seconds = EXCLUDED.avg_decision_seconds
+""")
+
+
+def _month_start(d: date, offset: int = 0) -> date:
+    m = d.month - 1 + offset
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def _create_month_partition(conn, start: date, end: date) -> None:
+    """Create and attach the partition for [start, end), moving rows out of DEFAULT first.
+
+    A plain CREATE ... PARTITION OF fails once the DEFAULT partition holds rows
+    for that month (e.g. the job didn't run for a while), so build the table
+    standalone, move those rows into it, then ATTACH.
+    """
+    name = f"swipe_events_{start:%Y%m}"
+    conn.execute(text(f"CREATE TABLE {name} (LIKE swipe_events INCLUDING DEFAULTS)"))
+    conn.execute(
+        text(f"""
+            WITH moved AS (
+                DELETE FROM swipe_events_default
+                WHERE occurred_at >= :start AND occurred_at < :end
+                RETURNING id, occurred_at, user_id, track_id, event_type, from_state
+            )
+            INSERT INTO {name} (id, occurred_at, user_id, track_id, event_type, from_state)
+            SELECT id, occurred_at, user_id, track_id, event_type, from_state FROM moved
+        """),
+        {"start": start, "end": end},
+    )
+    conn.execute(text(
+        f"ALTER TABLE swipe_events ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"
+    ))
+
+
+def ensure_partitions(months_ahead: int = 2, months_back: int = 3) -> None:
+    """Create missing monthly swipe_events partitions from months_back to months_ahead.
+
+    Each month is its own transaction; a failure is logged and the rest continue.
+    """
+    today = date.today()
+    engine = get_engine()
+    for offset in range(-months_back, months_ahead + 1):
+        start, end = _month_start(today, offset), _month_start(today, offset + 1)
+        name = f"swipe_events_{start:%Y%m}"
+        try:
+            with engine.begin() as conn:
+                if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+                    continue
+                _create_month_partition(conn, start, end)
+                logger.info("created partition %s", name)
+        except Exception:
+            logger.exception("could not create partition %s", name)
+
+
+def rollup_days(start: date, end: date) -> None:
+    """(Re)build aggregates for days in [start, end); idempotent via upsert."""
+    with get_engine().begin() as conn:
+        conn.execute(ROLLUP_SQL, {"start": start, "end": end})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=2, help="Days back to roll up (including today)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # Partition upkeep failures are logged inside; the rollup still runs
+    ensure_partitions()
+    today = date.today()
+    rollup_days(today - timedelta(days=args.days - 1), today + timedelta(days=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,17 @@
-from app.redis_client import redis_client
+from app.redis_client import get_redis
 
 _PKCE_TTL_SECONDS = 600
 
 def save_pkce_state(state: str, verifier: str) -> None:
     """Store verifier in Redis keyed by state."""
     key = f"pkce:{state}"
-    redis_client.setex(key, _PKCE_TTL_SECONDS, verifier)
+    get_redis().setex(key, _PKCE_TTL_SECONDS, verifier)
 
 
 def pop_pkce_verifier(state: str) -> None:
     """Get verifier for state and delete key (one-time use)."""
     key = f"pkce:{state}"
-    with redis_client.pipeline() as pipe:
+    with get_redis().pipeline() as pipe:
         pipe.get(key)
         pipe.delete(key)
         verifier, _ = pipe.execute()
@@ -3,13 +3,13 @@ from uuid import UUID
 from typing import Annotated
 from urllib.parse import urlencode
 
-import httpx
 from app.auth.pkce import (generate_code_challenge, generate_code_verifier,
                            generate_state)
 from app.auth.pkce_store import pop_pkce_verifier, save_pkce_state
 from app.auth.session_store import create_session, delete_session, get_session
 from app.config import get_settings
 from app.db import get_db
+from app.http_client import get_http_client
 from app.models import SpotifyToken, User
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse, RedirectResponse
@@ -17,7 +17,6 @@ from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
 
 router = APIRouter()
-settings = get_settings()
 
 
 def get_current_user(
@@ -42,11 +41,13 @@ class MeResponse(BaseModel):
     spotify_user_id: str
     display_name: str | None
     avatar_url: str | None
+    queue_order: str
 
 
 @router.get("/login")
 def login() -> dict:
     """Build PKCE authorize URL for Spotify."""
+    settings = get_settings()
     verifier = generate_code_verifier()
     challenge = generate_code_challenge(verifier)
     state = generate_state()
@@ -73,6 +74,7 @@ def callback(
     db: Session = Depends(get_db)
 ):
     """Exchange code for tokens, fetch profile, upsert user and token in DB."""
+    settings = get_settings()
     verifier = pop_pkce_verifier(state)
     if verifier is None:
         raise HTTPException(status_code=400, detail="Invalid state")
@@ -86,8 +88,7 @@ def callback(
         "code_verifier": verifier
     }
 
-    with httpx.Client() as client:
-        token_response = client.post(token_url, data=data)
+    token_response = get_http_client().post(token_url, data=data)
     if token_response.status_code != 200:
         raise HTTPException(
             status_code=502,
@@ -107,8 +108,10 @@ def callback(
             detail="No refresh token returned from Spotify"
         )
 
-    with httpx.Client(headers={"Authorization": f"Bearer {access_token}"}) as client:
-        me_response = client.get("https://api.spotify.com/v1/me")
+    me_response = get_http_client().get(
+        "https://api.spotify.com/v1/me",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
     if me_response.status_code != 200:
         raise HTTPException(
             status_code=502,
@@ -174,6 +177,7 @@ def me(current_user: User = Depends(get_current_user)) -> MeResponse:
 @router.post("/logout")
 def logout(request: Request):
     """Invalid session and clear session cookie"""
+    settings = get_settings()
     session_id = request.cookies.get("cur8_session")
     if session_id:
         delete_session(session_id)
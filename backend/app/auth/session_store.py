@@ -1,7 +1,7 @@
 import secrets
 from uuid import UUID
 
-from app.redis_client import redis_client
+from app.redis_client import get_redis
 
 _SESSION_TTL_SECONDS = 7 * 24 * 3600  # 7 days
 
@@ -10,7 +10,7 @@ def create_session(user_id: UUID) -> str:
     """Create session in Redis for user_id."""
     sid = secrets.token_urlsafe(32)
     key = f"session:{sid}"
-    redis_client.setex(key, _SESSION_TTL_SECONDS, str(user_id))
+    get_redis().setex(key, _SESSION_TTL_SECONDS, str(user_id))
     return sid
 
 
@@ -19,10 +19,10 @@ def get_session(session_id: str) -> str | None:
     if not session_id:
         return None
     key = f"session:{session_id}"
-    return redis_client.get(key)
+    return get_redis().get(key)
 
 
 def delete_session(session_id: str) -> None:
     """Delete session key (logout)."""
     if session_id:
-        redis_client.delete(f"session:{session_id}")
\ No newline at end of file
+        get_redis().delete(f"session:{session_id}")
\ No newline at end of file
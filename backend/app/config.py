@@ -12,6 +12,20 @@ class Settings(BaseSettings):
     session_secret: str
     frontend_url: str
     environment: str = "development"  # "production" → secure cookies, etc.
+    health_probe_interval_seconds: float = 10.0
+    event_flush_interval_seconds: float = 2.0
+    event_buffer_max: int = 50_000
+    profile_sample_rate: float = 0.0  # fraction of requests to profile (0 = off)
+    profile_admin_token: str | None = None  # X-Cur8-Profile / X-Cur8-Admin value; enables profiling
+    profile_ring_size: int = 50  # slowest traces kept in memory
+    export_pool_size: int = 2  # concurrent /tracks/export streams (own pool, not the request pool)
+    export_pool_timeout_seconds: float = 2.0
+    export_idle_timeout_ms: int = 60_000  # server drops an export stalled this long mid-transaction
+    export_statement_timeout_ms: int = 300_000
+    artwork_cache_dir: str = "/tmp/cur8/artwork"
+    artwork_cache_max_bytes: int = 256 * 1024 * 1024
+    preview_cache_dir: str = "/tmp/cur8/previews"
+    preview_cache_max_bytes: int = 1024 * 1024 * 1024
 
     model_config = SettingsConfigDict(
         env_file="../.env",
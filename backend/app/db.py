@@ -1,24 +1,61 @@
+from functools import lru_cache
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
 from .config import get_settings
 
-settings = get_settings()
-
-# SQL engine and session
-engine = create_engine(
-    settings.database_url,
-    echo=False,  # sql logging
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factory; bound to the engine on first get_engine() call
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 # Base for ORM model
 Base = declarative_base()
 
+
+@lru_cache
+def get_engine() -> Engine:
+    """Create SQL engine on first use (not at import) and bind SessionLocal to it."""
+    engine = create_engine(
+        get_settings().database_url,
+        echo=False,  # sql logging
+    )
+    SessionLocal.configure(bind=engine)
+    return engine
+
+
+@lru_cache
+def get_export_engine() -> Engine:
+    """Small separate engine for streaming exports.
+
+    A download holds its connection (and an open transaction) for as long as the
+    client takes, so exports get their own capped pool and server-side timeouts
+    instead of draining the request pool.
+    """
+    settings = get_settings()
+    options = (
+        f"-c idle_in_transaction_session_timeout={settings.export_idle_timeout_ms} "
+        f"-c statement_timeout={settings.export_statement_timeout_ms}"
+    )
+    return create_engine(
+        settings.database_url,
+        pool_size=settings.export_pool_size,
+        max_overflow=0,
+        pool_timeout=settings.export_pool_timeout_seconds,
+        connect_args={"options": options},
+    )
+
+
+def new_session() -> Session:
+    """Return a new session (creating the engine if needed)."""
+    get_engine()
+    return SessionLocal()
+
+
 def get_db():
     """Dependency: yield session, close on exit."""
-    db = SessionLocal()
+    db = new_session()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
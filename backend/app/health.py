@@ -0,0 +1,99 @@
+"""Background readiness prober: checks Postgres, Redis, pool and Spotify on an interval."""
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.db import get_engine
+from app.http_client import get_http_client
+from app.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+SPOTIFY_PROBE_URL = "https://accounts.spotify.com/.well-known/openid-configuration"
+
+# Latest probe result; /ready serves this instead of doing I/O per request
+_last_result: dict | None = None
+
+
+def _timed(check) -> dict:
+    """Run check(); return {"ok", "latency_ms"} plus any extra fields or the error class."""
+    start = time.perf_counter()
+    try:
+        extra = check() or {}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2), **extra}
+    except Exception as e:
+        # Full message (may contain hosts/DSNs) goes to the log; /ready is unauthenticated
+        logger.warning("readiness check %s failed", getattr(check, "__name__", check), exc_info=True)
+        return {"ok": False, "latency_ms": round((time.perf_counter() - start) * 1000, 2), "error": type(e).__name__}
+
+
+def _check_postgres() -> None:
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def _check_redis() -> None:
+    get_redis().ping()
+
+
+def _check_spotify() -> None:
+    get_http_client().get(SPOTIFY_PROBE_URL, timeout=3.0).raise_for_status()
+
+
+def pool_stats() -> dict:
+    """Connection pool usage for the SQL engine (QueuePool)."""
+    pool = get_engine().pool
+    size = pool.size() if hasattr(pool, "size") else 0
+    checked_out = pool.checkedout() if hasattr(pool, "checkedout") else 0
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    capacity = size + max(max_overflow, 0)
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "overflow": pool.overflow() if hasattr(pool, "overflow") else 0,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 0.0,
+    }
+
+
+def probe_once() -> dict:
+    """Run all checks (blocking); Spotify and pool usage are reported but don't gate readiness."""
+    checks = {
+        "postgres": _timed(_check_postgres),
+        "redis": _timed(_check_redis),
+        "spotify": _timed(_check_spotify),
+    }
+    pool = pool_stats()
+    # A saturated pool is load, not a broken dependency: pulling the instance would shift it elsewhere
+    ready = checks["postgres"]["ok"] and checks["redis"]["ok"]
+    return {"ready": ready, "checked_at": time.time(), "checks": checks, "pool": pool}
+
+
+async def run_prober(interval: float) -> None:
+    """Probe forever in a worker thread every interval seconds (cancelled on shutdown)."""
+    global _last_result
+    while True:
+        try:
+            _last_result = await asyncio.to_thread(probe_once)
+        except Exception as e:
+            # Keep probing; report not ready instead of letting the result go stale
+            logger.exception("readiness probe failed")
+            _last_result = {"ready": False, "checked_at": time.time(), "error": type(e).__name__}
+        await asyncio.sleep(interval)
+
+
+def get_readiness() -> tuple[bool, dict]:
+    """Return (ready, cached result); stale or missing results count as not ready."""
+    interval = get_settings().health_probe_interval_seconds
+    result = _last_result
+    if result is None:
+        return False, {"ready": False, "detail": "No probe result yet"}
+    age = time.time() - result["checked_at"]
+    body = {**result, "age_seconds": round(age, 2)}
+    if age > 3 * interval:
+        return False, {**body, "ready": False, "detail": "Probe result is stale"}
+    return result["ready"], body
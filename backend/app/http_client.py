@@ -0,0 +1,14 @@
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+from app.profiling import httpx_event_hooks
+
+
+@lru_cache
+def get_http_client() -> httpx.Client:
+    """Shared outbound HTTP client (connection pooling; profiling hooks when enabled)."""
+    # Shared across users, so never store cookies (a Set-Cookie would leak into others' requests)
+    no_cookies = CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.Client(timeout=10.0, event_hooks=httpx_event_hooks(), cookies=no_cookies)
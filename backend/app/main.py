@@ -1,16 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from app.auth import routes as auth_routes
 from app.tracks import routes as tracks_routes
-from fastapi import Depends, FastAPI
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, ORJSONResponse
 
+from .analytics import event_log
 from .config import get_settings
-from .db import get_db
+from .db import get_engine, get_export_engine
+from .http_client import get_http_client
+from .health import get_readiness, run_prober
+from . import profiling
+from .redis_client import get_redis
 
 settings = get_settings()
 
-app = FastAPI(title="Cur8")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build engine/Redis and start background tasks at startup; stop and release on shutdown."""
+    engine = get_engine()
+    redis_client = get_redis()
+    prober = asyncio.create_task(run_prober(settings.health_probe_interval_seconds))
+    flusher = asyncio.create_task(event_log.run_flusher(settings.event_flush_interval_seconds))
+    yield
+    for task in (prober, flusher):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    # Write out whatever swipe events are still buffered
+    await asyncio.to_thread(event_log.flush)
+    engine.dispose()
+    if get_export_engine.cache_info().currsize:
+        get_export_engine().dispose()
+    redis_client.close()
+    get_http_client().close()
+    # Drop the closed client so a later startup in this process gets a fresh one
+    get_http_client.cache_clear()
+
+
+app = FastAPI(title="Cur8", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Request profiling (no-op unless PROFILE_SAMPLE_RATE / PROFILE_ADMIN_TOKEN are set)
+profiling.install(app)
 
 # CORS Middleware (allow_origins = comma-separated frontend URLs, e.g. https://cur8-vercel.vercel.app)
 _origins = [o.strip() for o in settings.allowed_origins.split(",") if o.strip()]
@@ -24,9 +58,16 @@ app.add_middleware(
 
 # API routes and endpoints
 @app.get("/health", tags=["meta"])
-def health(db: Session = Depends(get_db)) -> dict:
-    db.execute(text("SELECT 1"))
+async def health() -> dict:
+    """Liveness: process is up and serving (no I/O)."""
     return {"status": "ok"}
 
+
+@app.get("/ready", tags=["meta"])
+async def ready() -> JSONResponse:
+    """Readiness: cached result of the background Postgres/Redis/pool prober."""
+    is_ready, body = get_readiness()
+    return JSONResponse(content=body, status_code=200 if is_ready else 503)
+
 app.include_router(auth_routes.router, prefix="/auth", tags=["auth"])
 app.include_router(tracks_routes.router, prefix="/tracks", tags=["tracks"])
\ No newline at end of file
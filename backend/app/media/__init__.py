@@ -0,0 +1 @@
+# Local media caches (artwork thumbnails, ...)
@@ -0,0 +1,76 @@
+"""Artwork thumbnails: fetch each Spotify image once, cache resized variants on disk."""
+
+import io
+from functools import lru_cache
+from pathlib import Path
+
+from app.config import get_settings
+from app.http_client import get_http_client
+from app.media.disk_cache import DiskCache
+from app.models import Track
+
+# Allowed output sizes (px); requests snap up to the nearest bucket to bound variants
+ARTWORK_SIZES = (64, 160, 300, 640)
+
+
+@lru_cache
+def get_artwork_cache() -> DiskCache:
+    settings = get_settings()
+    return DiskCache(
+        settings.artwork_cache_dir,
+        settings.artwork_cache_max_bytes,
+        suffix=".jpg",
+    )
+
+
+def snap_size(size: int) -> int:
+    """Return smallest bucket >= size (or the largest bucket)."""
+    for bucket in ARTWORK_SIZES:
+        if bucket >= size:
+            return bucket
+    return ARTWORK_SIZES[-1]
+
+
+def pick_source_image(track: Track, size: int) -> dict | None:
+    """Pick the smallest Spotify image that still covers size (falls back to artwork_url)."""
+    images = [i for i in (track.artwork_images or []) if i.get("url")]
+    if not images:
+        return {"url": track.artwork_url, "width": None} if track.artwork_url else None
+    covering = [i for i in images if (i.get("width") or 0) >= size]
+    if covering:
+        return min(covering, key=lambda i: i["width"])
+    return max(images, key=lambda i: i.get("width") or 0)
+
+
+def _resize(data: bytes, size: int) -> bytes:
+    """Downscale to fit size x size as JPEG; return original bytes if Pillow is missing."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return data
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGB")
+        img.thumbnail((size, size), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+def get_artwork_path(track: Track, size: int) -> Path | None:
+    """Return path to cached thumbnail of track at size, fetching + resizing on miss."""
+    source = pick_source_image(track, size)
+    if source is None:
+        return None
+    cache = get_artwork_cache()
+    key = f"{source['url']}@{size}"
+    path = cache.get(key)
+    if path is not None:
+        return path
+
+    r = get_http_client().get(source["url"])
+    r.raise_for_status()
+    data = r.content
+    # Only re-encode when the chosen original is larger than requested
+    if source.get("width") is None or source["width"] > size:
+        data = _resize(data, size)
+    return cache.put(key, data)
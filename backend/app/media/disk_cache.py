@@ -0,0 +1,92 @@
+"""Key-addressed on-disk blob cache with LRU size eviction (mtime = last access)."""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Files touched this recently are never evicted, so a path just returned by
+# get()/put() stays readable while the response is being sent
+EVICT_GRACE_SECONDS = 60
+
+
+class DiskCache:
+    """Store blobs under sha256(key), evicting least-recently-used files past max_bytes."""
+
+    def __init__(self, root: str, max_bytes: int, suffix: str = ""):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None  # lazily scanned on first put
+
+    def path_for(self, key: str) -> Path:
+        """Return sharded path for key (e.g. root/ab/abcdef...)."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}{self.suffix}"
+
+    def get(self, key: str) -> Path | None:
+        """Return cached file path (and bump its LRU position) or None on miss."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Write blob atomically (temp file + rename) and evict if over budget."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            with self._lock:
+                # Overwriting an existing entry: only the size difference counts
+                try:
+                    replaced_bytes = path.stat().st_size
+                except FileNotFoundError:
+                    replaced_bytes = 0
+                os.replace(tmp, path)
+                if self._total_bytes is None:
+                    self._total_bytes = sum(size for _, size, _ in self._scan())
+                else:
+                    self._total_bytes += len(data) - replaced_bytes
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return path
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        """Return (mtime, size, path) for every cached file."""
+        entries = []
+        if not self.root.exists():
+            return entries
+        for p in self.root.glob(f"*/*{self.suffix}"):
+            if p.name.startswith(".tmp-"):
+                continue
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete oldest files until under 90% of max_bytes (hysteresis avoids rescans per put)."""
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        recent = time.time() - EVICT_GRACE_SECONDS
+        for mtime, size, p in entries:
+            if total <= target or mtime >= recent:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
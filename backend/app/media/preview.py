@@ -0,0 +1,61 @@
+"""Preview clips: cache Spotify 30s previews on disk and serve them with Range support."""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+from fastapi.responses import FileResponse
+
+from app.config import get_settings
+from app.http_client import get_http_client
+from app.media.disk_cache import DiskCache
+
+
+@lru_cache
+def get_preview_cache() -> DiskCache:
+    settings = get_settings()
+    return DiskCache(
+        settings.preview_cache_dir,
+        settings.preview_cache_max_bytes,
+        suffix=".mp3",
+    )
+
+
+def get_preview_path(preview_url: str) -> Path:
+    """Return path to cached clip, downloading it once on miss."""
+    cache = get_preview_cache()
+    path = cache.get(preview_url)
+    if path is not None:
+        return path
+    r = get_http_client().get(preview_url)
+    r.raise_for_status()
+    if not r.content:
+        # Never cache an empty 200 from the CDN (it would be served forever)
+        raise httpx.HTTPError(f"Empty preview body from {preview_url}")
+    return cache.put(preview_url, r.content)
+
+
+def warm_preview_cache(preview_urls: list[str]) -> None:
+    """Download clips for upcoming tracks (background task); failures are ignored."""
+    cache = get_preview_cache()
+    for url in preview_urls:
+        if cache.get(url) is not None:
+            continue
+        try:
+            get_preview_path(url)
+        except httpx.HTTPError:
+            pass
+
+
+def preview_response(path: Path, cache_control: str) -> FileResponse:
+    """Serve a cached clip; Starlette's FileResponse handles Range / 206 / 416 itself.
+
+    Raises FileNotFoundError if the cached file was evicted meanwhile.
+    """
+    return FileResponse(
+        path,
+        stat_result=os.stat(path),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": cache_control},
+    )
@@ -0,0 +1,25 @@
+"""Version tags for media URLs keyed by track id.
+
+/tracks/{id}/artwork and /preview serve whatever Spotify URL the row currently
+points at, and sync can change it. Clients append ?v=<source_version(url)>
+(same FNV-1a hash as frontend/src/api.ts); only a matching v is cacheable forever.
+"""
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=300"  # unversioned or stale v: short, then ETag revalidation
+
+
+def source_version(url: str) -> str:
+    """32-bit FNV-1a of the source URL as 8 hex chars."""
+    h = 0x811C9DC5
+    for b in url.encode("utf-8"):
+        h ^= b
+        h = (h * 0x01000193) & 0xFFFFFFFF
+    return f"{h:08x}"
+
+
+def cache_control(source_url: str | None, version: str | None) -> str:
+    """Cache-Control for a response whose content comes from source_url."""
+    if source_url and version and version == source_version(source_url):
+        return IMMUTABLE
+    return REVALIDATE
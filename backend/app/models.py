@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import JSON, BigInteger, Column, Date, Float, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -13,6 +13,7 @@ class User(Base):
     spotify_user_id = Column(String, unique=True, index=True, nullable=False)
     display_name = Column(String, nullable=True)
     avatar_url = Column(String, nullable=True)
+    queue_order = Column(String(20), nullable=False, server_default="random")  # see tracks.service.QUEUE_ORDERS
 
     track_states = relationship("UserTrackState", back_populates="user")
     token = relationship("SpotifyToken", back_populates="user", uselist=False)
@@ -38,6 +39,21 @@ class SpotifyToken(Base):
 class Track(Base):
     """Track relation for SQL"""
     __tablename__ = "tracks"
+    __table_args__ = (
+        # ILIKE '%x%' filters on /tracks/library (needs the pg_trgm extension)
+        Index(
+            "ix_tracks_artists_trgm",
+            "artists",
+            postgresql_using="gin",
+            postgresql_ops={"artists": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_tracks_album_name_trgm",
+            "album_name",
+            postgresql_using="gin",
+            postgresql_ops={"album_name": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     spotify_track_id = Column(String, unique=True, index=True, nullable=False)
@@ -45,18 +61,75 @@ class Track(Base):
     artists = Column(String, nullable=True)
     album_name = Column(String, nullable=True)
     artwork_url = Column(String, nullable=True)
+    artwork_images = Column(JSON, nullable=True)  # [{"url", "width", "height"}, ...] from Spotify album
     preview_url = Column(String, nullable=True)
     duration_ms = Column(Integer, nullable=True)
 
     user_states = relationship("UserTrackState", back_populates="track")
 
+_PENDING = text("state = 'pending'")
+
+
 class UserTrackState(Base):
-    """Per-user, per track: pending | kept | removed"""
+    """Per-user, per track: pending | kept | removed
+
+    LIST-partitioned by state: user_track_states_pending (hot, swipe path) and
+    user_track_states_decided (kept/removed history). The partition key must be
+    part of the primary key, so it is (user_id, track_id, state); changing state
+    is a PK update that moves the row between partitions. The partitions
+    themselves (and the decided side's unique (user_id, track_id) index) exist
+    only in the migration.
+    """
     __tablename__ = "user_track_states"
+    __table_args__ = (
+        # Keyset pagination for /tracks/library: (updated_at, track_id) is the cursor
+        Index("ix_user_track_states_user_updated", "user_id", "updated_at", "track_id"),
+        Index("ix_user_track_states_user_state_updated", "user_id", "state", "updated_at", "track_id"),
+        # Orphan-track GC (NOT EXISTS by track_id) and ON DELETE CASCADE from tracks
+        Index("ix_user_track_states_track_id", "track_id"),
+        # One partial index per queue order so /tracks/next is a single index probe
+        Index("ix_uts_pending_random", "user_id", "random_key", "track_id", postgresql_where=_PENDING),
+        Index("ix_uts_pending_added", "user_id", "added_at", "track_id", postgresql_where=_PENDING),
+        Index("ix_uts_pending_artist", "user_id", "artist_sort", "track_id", postgresql_where=_PENDING),
+        Index("ix_uts_pending_duration", "user_id", "duration_ms", "track_id", postgresql_where=_PENDING),
+        {"postgresql_partition_by": "LIST (state)"},
+    )
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
     track_id = Column(UUID(as_uuid=True), ForeignKey("tracks.id", ondelete="CASCADE"), primary_key=True)
-    state = Column(String(20), nullable=False)  # "pending" | "kept" | "removed"
+    state = Column(String(20), primary_key=True)  # "pending" | "kept" | "removed"; partition key
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    # Queue sort keys, written at sync time
+    added_at = Column(DateTime, nullable=True)  # when the user liked it on Spotify
+    artist_sort = Column(String, nullable=True)  # lower(first artist)
+    duration_ms = Column(Integer, nullable=True)  # copy of Track.duration_ms
+    random_key = Column(Float, nullable=True)  # uniform [0, 1), fixed per row
 
     user = relationship("User", back_populates="track_states")
-    track = relationship("Track", back_populates="user_states")
\ No newline at end of file
+    track = relationship("Track", back_populates="user_states")
+
+
+class SwipeEvent(Base):
+    """Append-only log of state transitions (synced | kept | removed), range-partitioned by month.
+
+    No FKs: rows are written in bulk via COPY and only read by analytics.
+    """
+    __tablename__ = "swipe_events"
+    __table_args__ = {"postgresql_partition_by": "RANGE (occurred_at)"}
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime, primary_key=True)  # partition key must be in the PK
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    track_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(String(20), nullable=False)
+    from_state = Column(String(20), nullable=True)
+
+
+class SwipeEventDaily(Base):
+    """Per-day, per-user, per-event_type rollup of swipe_events"""
+    __tablename__ = "swipe_event_daily"
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+    event_type = Column(String(20), primary_key=True)
+    event_count = Column(Integer, nullable=False)
+    avg_decision_seconds = Column(Float, nullable=True)  # mean gap between consecutive decisions
@@ -0,0 +1,186 @@
+"""Opt-in request profiling: SQL + outbound HTTP spans, slowest traces kept in memory.
+
+Enabled when PROFILE_SAMPLE_RATE > 0 or PROFILE_ADMIN_TOKEN is set. When disabled
+nothing is installed (no middleware, no SQLAlchemy listeners, no httpx hooks).
+"""
+
+import heapq
+import itertools
+import random
+import secrets
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Header, HTTPException, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+PROFILE_HEADER = "x-cur8-profile"  # value must equal PROFILE_ADMIN_TOKEN
+SQL_LABEL_MAX = 200
+
+
+@dataclass
+class Trace:
+    method: str
+    path: str
+    started_at: float = field(default_factory=time.time)
+    status_code: int = 0
+    total_ms: float = 0.0
+    spans: list[dict] = field(default_factory=list)
+    closed: bool = False  # set once the response is done; background tasks still hold the context
+
+    def add_span(self, kind: str, label: str, start: float, end: float) -> None:
+        if self.closed:
+            return
+        self.spans.append({
+            "kind": kind,
+            "label": label,
+            "offset_ms": round((start - self._t0) * 1000, 2),
+            "ms": round((end - start) * 1000, 2),
+        })
+
+    def __post_init__(self) -> None:
+        self._t0 = time.perf_counter()
+
+    def to_dict(self) -> dict:
+        sql_ms = sum(s["ms"] for s in self.spans if s["kind"] == "sql")
+        http_ms = sum(s["ms"] for s in self.spans if s["kind"] == "http")
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "total_ms": self.total_ms,
+            "sql_ms": round(sql_ms, 2),
+            "http_ms": round(http_ms, 2),
+            "other_ms": round(max(self.total_ms - sql_ms - http_ms, 0.0), 2),
+            "spans": self.spans,
+        }
+
+
+# Trace of the request being profiled (copied into threadpool workers with the context)
+_current_trace: ContextVar[Trace | None] = ContextVar("cur8_trace", default=None)
+
+
+class SlowestTraces:
+    """Keep the N slowest traces (min-heap on total_ms)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._heap: list[tuple[float, int, Trace]] = []
+        self._counter = itertools.count()  # tie-breaker so Trace is never compared
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace) -> None:
+        item = (trace.total_ms, next(self._counter), trace)
+        with self._lock:
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, item)
+            elif trace.total_ms > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            items = sorted(self._heap, reverse=True)
+        return [t.to_dict() for _, _, t in items]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+
+
+_slowest: SlowestTraces | None = None
+
+
+def is_enabled() -> bool:
+    settings = get_settings()
+    return settings.profile_sample_rate > 0 or bool(settings.profile_admin_token)
+
+
+# SQL timings via engine events (registered on the Engine class, so it covers the lazy engine)
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_trace.get() is not None:
+        conn.info.setdefault("cur8_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current_trace.get()
+    starts = conn.info.get("cur8_query_start")
+    if trace is None or not starts:
+        return
+    start = starts.pop()
+    trace.add_span("sql", " ".join(statement.split())[:SQL_LABEL_MAX], start, time.perf_counter())
+
+
+# Outbound HTTP timings via httpx client event hooks (see app.http_client)
+def _on_request(request) -> None:
+    if _current_trace.get() is not None:
+        request.extensions["cur8_start"] = time.perf_counter()
+
+
+def _on_response(response) -> None:
+    trace = _current_trace.get()
+    start = response.request.extensions.get("cur8_start")
+    if trace is None or start is None:
+        return
+    req = response.request
+    label = f"{req.method} {req.url.host}{req.url.path} → {response.status_code}"
+    trace.add_span("http", label, start, time.perf_counter())
+
+
+def httpx_event_hooks() -> dict:
+    """Event hooks for httpx clients; empty when profiling is off."""
+    if not is_enabled():
+        return {}
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def _is_admin(token: str | None) -> bool:
+    expected = get_settings().profile_admin_token
+    return bool(expected and token and secrets.compare_digest(token, expected))
+
+
+def install(app: FastAPI) -> None:
+    """Add profiling middleware, SQL listeners and the admin endpoint (only if enabled)."""
+    global _slowest
+    if not is_enabled():
+        return
+    settings = get_settings()
+    _slowest = SlowestTraces(settings.profile_ring_size)
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.middleware("http")
+    async def profile_requests(request: Request, call_next):
+        sampled = random.random() < settings.profile_sample_rate
+        if not sampled and not _is_admin(request.headers.get(PROFILE_HEADER)):
+            return await call_next(request)
+        trace = Trace(method=request.method, path=request.url.path)
+        token = _current_trace.set(trace)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+            trace.status_code = response.status_code
+            return response
+        finally:
+            trace.total_ms = round((time.perf_counter() - start) * 1000, 2)
+            trace.closed = True
+            _current_trace.reset(token)
+            _slowest.add(trace)
+
+    @app.get("/admin/profiles", tags=["admin"])
+    def slowest_profiles(
+        x_cur8_admin: str | None = Header(default=None),
+        clear: bool = False,
+    ) -> list[dict]:
+        """Return the slowest profiled requests (X-Cur8-Admin: PROFILE_ADMIN_TOKEN)."""
+        if not _is_admin(x_cur8_admin):
+            raise HTTPException(status_code=404, detail="Not Found")
+        traces = _slowest.snapshot()
+        if clear:
+            _slowest.clear()
+        return traces
@@ -1,12 +1,19 @@
-import redis
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from .config import get_settings
 
-settings = get_settings()
+if TYPE_CHECKING:
+    import redis
 
-# Redis client
-redis_client = redis.Redis.from_url(
-    settings.redis_url,
-    encoding="utf-8",
-    decode_responses=True
-)
\ No newline at end of file
+
+@lru_cache
+def get_redis() -> "redis.Redis":
+    """Create Redis client on first use (not at import)."""
+    import redis
+
+    return redis.Redis.from_url(
+        get_settings().redis_url,
+        encoding="utf-8",
+        decode_responses=True
+    )
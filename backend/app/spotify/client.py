@@ -1,8 +1,8 @@
 from datetime import datetime
 
-import httpx
 from sqlalchemy.orm import Session
 
+from app.http_client import get_http_client
 from app.models import User
 from app.spotify.refresh import refresh_access_token
 
@@ -26,27 +26,38 @@ class SpotifyClient:
         self._headers = {"Authorization": f"Bearer {access_token}"}
 
     def _get(self, path: str, params: dict | None = None) -> dict:
-        r = httpx.get(f"{SPOTIFY_API}{path}", headers=self._headers, params=params or {}, timeout=10.0)
+        r = get_http_client().get(f"{SPOTIFY_API}{path}", headers=self._headers, params=params or {})
         if r.status_code == 401:
             raise ValueError("Token expired or invalid")
         r.raise_for_status()
         return r.json()
 
+    def _get_raw(self, path: str, params: dict | None = None) -> bytes:
+        """Like _get but return the undecoded JSON body (for pass-through responses)."""
+        r = get_http_client().get(f"{SPOTIFY_API}{path}", headers=self._headers, params=params or {})
+        if r.status_code == 401:
+            raise ValueError("Token expired or invalid")
+        r.raise_for_status()
+        return r.content
+
     def get_saved_tracks(self, limit: int = 50, offset: int = 0) -> dict:
         """Call GET /v1/me/tracks. Returns Spotify response with items, total, etc."""
         return self._get("/me/tracks", params={"limit": limit, "offset": offset})
 
+    def get_saved_tracks_raw(self, limit: int = 50, offset: int = 0) -> bytes:
+        """Call GET /v1/me/tracks and return the raw JSON bytes (no decode/re-encode)."""
+        return self._get_raw("/me/tracks", params={"limit": limit, "offset": offset})
+
     def get_track(self, spotify_track_id: str) -> dict:
         """Call GET /v1/tracks/{id}. Returns full track object (includes preview_url)."""
         return self._get(f"/tracks/{spotify_track_id}")
 
     def remove_saved_track(self, spotify_track_id: str) -> None:
         """Call DELETE /v1/me/tracks. Remove track from user's Spotify library"""
-        r = httpx.delete(
+        r = get_http_client().delete(
             f"{SPOTIFY_API}/me/tracks",
             headers = self._headers,
             params = {"ids": spotify_track_id},
-            timeout = 10.0,
         )
         if r.status_code == 401:
             raise ValueError("Token expired or invalid")
@@ -3,7 +3,7 @@
 import time
 from uuid import UUID
 
-from app.redis_client import redis_client
+from app.redis_client import get_redis
 
 BUCKET_KEY_PREFIX = "spotify_tb:"
 MAX_TOKENS = 30
@@ -32,6 +32,6 @@ def check_rate_limit(user_id: UUID) -> None:
 
     key = f"{BUCKET_KEY_PREFIX}{user_id}"
     now = str(time.time())
-    result = redis_client.eval(LUA_SCRIPT, 1, key, str(MAX_TOKENS), str(REFILL_RATE), now)
+    result = get_redis().eval(LUA_SCRIPT, 1, key, str(MAX_TOKENS), str(REFILL_RATE), now)
     if result not in (1, "1"):
         raise HTTPException(status_code=429, detail="Too many Spotify requests; try shortly.")
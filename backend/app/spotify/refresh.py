@@ -1,12 +1,11 @@
 from datetime import datetime, timedelta
 
-import httpx
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
+from app.http_client import get_http_client
 from app.models import SpotifyToken
 
-settings = get_settings()
 TOKEN_URL = "https://accounts.spotify.com/api/token"
 
 BUFFER_SECONDS = 60
@@ -17,10 +16,9 @@ def refresh_access_token(db: Session, token: SpotifyToken) -> str:
     data = {
         "grant_type": "refresh_token",
         "refresh_token": token.refresh_token,
-        "client_id": settings.spotify_client_id,
+        "client_id": get_settings().spotify_client_id,
     }
-    with httpx.Client() as client:
-        resp = client.post(TOKEN_URL, data=data)
+    resp = get_http_client().post(TOKEN_URL, data=data)
     if resp.status_code != 200:
         raise ValueError(f"Spotify refresh failed: {resp.text}")
 
@@ -0,0 +1,128 @@
+"""Streaming export of a user's swipe decisions (CSV / NDJSON, optional gzip)."""
+
+import csv
+import io
+import zlib
+from collections.abc import Iterator
+from uuid import UUID
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db import get_export_engine
+from app.models import Track, UserTrackState
+
+EXPORT_COLUMNS = (
+    "spotify_track_id",
+    "name",
+    "artists",
+    "album_name",
+    "duration_ms",
+    "state",
+    "updated_at",
+)
+BATCH_SIZE = 1000
+
+
+def open_export_session() -> Session:
+    """Return a session on the export engine with its connection already checked out.
+
+    Raises sqlalchemy.exc.TimeoutError when all export slots are busy, so the route
+    can answer 503 before the response starts.
+    """
+    db = Session(bind=get_export_engine())
+    try:
+        db.connection()
+    except BaseException:
+        db.close()
+        raise
+    return db
+
+
+def iter_export_rows(db: Session, user_id: UUID, state: str | None = None) -> Iterator[tuple]:
+    """Yield plain row tuples via a server-side cursor (no ORM objects, flat memory).
+
+    Uses (and closes) a session from open_export_session: the request-scoped one
+    from get_db is closed before a StreamingResponse body is consumed.
+    """
+    stmt = (
+        select(
+            Track.spotify_track_id,
+            Track.name,
+            Track.artists,
+            Track.album_name,
+            Track.duration_ms,
+            UserTrackState.state,
+            UserTrackState.updated_at,
+        )
+        .join(UserTrackState, UserTrackState.track_id == Track.id)
+        .where(UserTrackState.user_id == user_id)
+        .order_by(UserTrackState.updated_at, UserTrackState.track_id)
+    )
+    if state is not None:
+        stmt = stmt.where(UserTrackState.state == state)
+    else:
+        stmt = stmt.where(UserTrackState.state != "pending")
+
+    try:
+        # yield_per implies stream_results → psycopg2 named (server-side) cursor
+        result = db.execute(stmt.execution_options(yield_per=BATCH_SIZE))
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        db.close()
+
+
+def _csv_chunks(rows: Iterator[tuple]) -> Iterator[bytes]:
+    """Encode rows as CSV, one chunk per BATCH_SIZE rows."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    n = 0
+    for row in rows:
+        *rest, updated_at = row
+        writer.writerow((*rest, updated_at.isoformat() if updated_at else ""))
+        n += 1
+        if n % BATCH_SIZE == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+
+def _ndjson_chunks(rows: Iterator[tuple]) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, one chunk per BATCH_SIZE rows."""
+    lines: list[bytes] = []
+    for row in rows:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        record["updated_at"] = record["updated_at"].isoformat() if record["updated_at"] else None
+        lines.append(orjson.dumps(record))
+        if len(lines) >= BATCH_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Wrap a byte stream in incremental gzip (wbits=31 → gzip header)."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def stream_export(
+    db: Session,
+    user_id: UUID,
+    fmt: str,
+    state: str | None = None,
+    gzip: bool = False,
+) -> Iterator[bytes]:
+    """Return byte iterator for StreamingResponse in the requested format."""
+    rows = iter_export_rows(db, user_id, state)
+    chunks = _csv_chunks(rows) if fmt == "csv" else _ndjson_chunks(rows)
+    return _gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,66 @@
+"""Maintenance jobs for tracks: batched garbage collection of orphaned rows.
+
+Run from backend/ (e.g. nightly cron / Railway scheduled job):
+    python -m app.tracks.maintenance                  # delete orphaned tracks
+    python -m app.tracks.maintenance --batch-size 500 --analyze
+"""
+
+import argparse
+import logging
+import time
+
+from sqlalchemy import text
+
+from app.db import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Tracks no user references any more (uses ix_user_track_states_track_id);
+# SKIP LOCKED so rows a concurrent sync holds FOR KEY SHARE are left alone (and it isn't blocked)
+DELETE_ORPHANS_SQL = text("""
+DELETE FROM tracks
+WHERE id IN (
+    SELECT t.id FROM tracks t
+    WHERE NOT EXISTS (SELECT 1 FROM user_track_states s WHERE s.track_id = t.id)
+    LIMIT :batch_size
+    FOR UPDATE SKIP LOCKED
+)
+""")
+
+
+def delete_orphaned_tracks(batch_size: int = 1000, pause_seconds: float = 0.05) -> int:
+    """Delete unreferenced Track rows in short transactions; return total deleted."""
+    total = 0
+    engine = get_engine()
+    while True:
+        with engine.begin() as conn:
+            deleted = conn.execute(DELETE_ORPHANS_SQL, {"batch_size": batch_size}).rowcount
+        total += deleted
+        if deleted < batch_size:
+            return total
+        # Let other writers in between batches
+        time.sleep(pause_seconds)
+
+
+def analyze_tables() -> None:
+    """Refresh planner stats after large deletes."""
+    with get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE tracks"))
+        conn.execute(text("ANALYZE user_track_states"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--analyze", action="store_true", help="ANALYZE tracks/user_track_states afterwards")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    deleted = delete_orphaned_tracks(args.batch_size)
+    logger.info("deleted %d orphaned tracks", deleted)
+    if args.analyze:
+        analyze_tables()
+
+
+if __name__ == "__main__":
+    main()
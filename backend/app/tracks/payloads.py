@@ -0,0 +1,17 @@
+"""Direct JSON encoding of track responses (no per-request pydantic validation).
+
+The field list comes from the response model itself (TrackResponse.model_fields),
+so a new field can't silently diverge. No cache: encoding these few scalars with
+orjson costs about as much as validating a cache entry would.
+"""
+
+import orjson
+from pydantic import BaseModel
+
+from app.models import Track
+
+
+def track_payload(track: Track, model: type[BaseModel]) -> bytes:
+    """Return JSON bytes equivalent to model.model_validate(track) for a flat, scalar-only model."""
+    # orjson encodes UUID natively, same string form as pydantic
+    return orjson.dumps({name: getattr(track, name) for name in model.model_fields})
@@ -1,23 +1,50 @@
+import os
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import httpx
+import sqlalchemy.exc
+from pydantic import BaseModel, ConfigDict, Field
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
 from app.auth.routes import get_current_user
 from app.db import get_db
-from app.models import Track, User, UserTrackState
+from app.models import Track, User
 from app.spotify import SpotifyClient, check_rate_limit, get_valid_access_token
 from sqlalchemy.orm import Session
-from app.tracks.service import get_next_track, sync_saved_tracks_for_user
+from app.media.artwork import get_artwork_path, snap_size
+from app.media.preview import get_preview_path, preview_response, warm_preview_cache
+from app.media.versioning import cache_control
+from app.tracks.export import open_export_session, stream_export
+from app.tracks.payloads import track_payload
+from app.tracks.service import (DEFAULT_QUEUE_ORDER, QUEUE_ORDERS, SwipeError,
+                                apply_swipe, claim_swipe_event, complete_swipe_event,
+                                fill_upcoming_tracks, get_next_track,
+                                list_library_page, release_swipe_event,
+                                sync_saved_tracks_for_user)
 
 router = APIRouter()
 
+# Built from the service's table so a new order only has to be added in one place
+QueueOrder = Literal[tuple(QUEUE_ORDERS)]
+
 
 class SwipeBody(BaseModel):
     spotify_track_id: str
     action: str  # "keep" | "remove"
+    event_id: str | None = Field(default=None, max_length=64)  # client idempotency key
+    client_ts: datetime | None = None  # when the swipe happened on the client
+
+
+class QueueOrderBody(BaseModel):
+    order: QueueOrder
+
+
+class SwipeBatchBody(BaseModel):
+    swipes: list[SwipeBody] = Field(max_length=500)  # applied in order
 
 class TrackResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -31,19 +58,33 @@ class TrackResponse(BaseModel):
     duration_ms: int | None
 
 
+class LibraryItem(TrackResponse):
+    state: str
+    updated_at: datetime
+
+
+class LibraryPage(BaseModel):
+    items: list[LibraryItem]
+    next_cursor: str | None
+
+
 @router.get("/next", response_model=TrackResponse | None)
 def get_next(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    order: Annotated[QueueOrder | None, Query(description="Default: user's saved queue_order")] = None,
 ):
     """Return next pending track for the current user; sync from Spotify if needed."""
+    if order is None:
+        order = current_user.queue_order if current_user.queue_order in QUEUE_ORDERS else DEFAULT_QUEUE_ORDER
     check_rate_limit(current_user.id)
     access_token = get_valid_access_token(current_user, db)
     client = SpotifyClient(access_token)
-    next_track = get_next_track(current_user, db)
+    next_track = get_next_track(current_user, db, order)
     if next_track is None:
         sync_saved_tracks_for_user(current_user, db, client)
-        next_track = get_next_track(current_user, db)
+        next_track = get_next_track(current_user, db, order)
     if next_track is None:
         return None
     # Backfill preview_url from Spotify if we don't have it (e.g. old rows or /me/tracks omitted it)
@@ -55,7 +96,63 @@ def get_next(
                 db.commit()
         except Exception:
             pass
-    return next_track
+    # Pre-pick the next few tracks and warm their preview clips after the response is sent
+    upcoming = fill_upcoming_tracks(current_user, db, next_track.id, order=order)
+    preview_urls = [t.preview_url for t in upcoming if t.preview_url]
+    if next_track.preview_url:
+        preview_urls.insert(0, next_track.preview_url)
+    if preview_urls:
+        background_tasks.add_task(warm_preview_cache, preview_urls)
+    # Encoded straight from the row (skips TrackResponse validation + jsonable_encoder)
+    return Response(
+        content=track_payload(next_track, TrackResponse),
+        media_type="application/json",
+        background=background_tasks,
+    )
+
+
+@router.put("/order")
+def set_queue_order(
+    body: QueueOrderBody,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Save the user's preferred queue order for /tracks/next."""
+    current_user.queue_order = body.order
+    db.commit()
+    return {"order": body.order}
+
+
+def _swipe_once(body: SwipeBody, user: User, db: Session) -> str:
+    """Apply one swipe with event_id dedup; return "ok" or "duplicate".
+
+    Raises 409 while an earlier attempt with the same event_id is still running,
+    so the client keeps the swipe queued instead of treating it as applied.
+    """
+    if body.action not in ("keep", "remove"):
+        raise HTTPException(400, "action must be 'keep' or 'remove'")
+    if body.event_id:
+        status = claim_swipe_event(user.id, body.event_id)
+        if status == "done":
+            # Retried event: cheap no-op, no DB or Spotify work
+            return "duplicate"
+        if status is not None:
+            raise HTTPException(409, "Swipe with this event_id is still being processed; retry")
+    try:
+        # Bucket guards Spotify calls; only remove hits Spotify
+        if body.action == "remove":
+            check_rate_limit(user.id)
+        result = apply_swipe(user, db, body.spotify_track_id, body.action, client_ts=body.client_ts)
+        if body.event_id:
+            complete_swipe_event(user.id, body.event_id)
+        return result
+    except BaseException as e:
+        db.rollback()
+        if body.event_id:
+            release_swipe_event(user.id, body.event_id)
+        if isinstance(e, SwipeError):
+            raise HTTPException(e.status_code, e.detail)
+        raise
 
 
 @router.post("/swipe")
@@ -64,23 +161,39 @@ def swipe(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Record keep or remove; for remove, also call Spotify to remove from library."""
-    if body.action not in ("keep", "remove"):
-        raise HTTPException(400, "action must be 'keep' or 'remove'")
-    check_rate_limit(current_user.id)
-    track = db.query(Track).filter_by(spotify_track_id=body.spotify_track_id).first()
-    if not track:
-        raise HTTPException(404, "Track not found")
-    state = db.query(UserTrackState).filter_by(user_id=current_user.id, track_id=track.id).first()
-    if not state or state.state != "pending":
-        raise HTTPException(400, "Track not pending")
-    state.state = "kept" if body.action == "keep" else "removed"
-    state.updated_at = datetime.now()
-    if body.action == "remove":
-        access_token = get_valid_access_token(current_user, db)
-        SpotifyClient(access_token).remove_saved_track(body.spotify_track_id)
-    db.commit()
-    return {"status": "ok"}
+    """Record keep or remove; for remove, also call Spotify to remove from library.
+
+    Idempotent: repeating an event_id (or the same decision) returns ok without side effects.
+    """
+    result = _swipe_once(body, current_user, db)
+    return {"status": "ok", "duplicate": result == "duplicate"}
+
+
+@router.post("/swipe/batch")
+def swipe_batch(
+    body: SwipeBatchBody,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Apply queued (offline) swipes in order; per-item results, stops at rate limit."""
+    results = []
+    for i, item in enumerate(body.swipes):
+        try:
+            result = _swipe_once(item, current_user, db)
+            results.append({"event_id": item.event_id, "status": result})
+        except HTTPException as e:
+            if e.status_code == 409:
+                # Same event_id still in flight from an earlier upload; client re-sends it
+                results.append({"event_id": item.event_id, "status": "retry"})
+                continue
+            if e.status_code == 429:
+                # Client keeps these queued and re-sends them later with the same event_ids
+                results.extend(
+                    {"event_id": rest.event_id, "status": "retry"} for rest in body.swipes[i:]
+                )
+                break
+            results.append({"event_id": item.event_id, "status": "error", "detail": e.detail})
+    return {"results": results}
 
 
 @router.get("/saved")
@@ -97,4 +210,131 @@ def saved_tracks(
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
     client = SpotifyClient(access_token)
-    return client.get_saved_tracks(limit=limit, offset=offset)
\ No newline at end of file
+    # Pass Spotify's JSON through as-is instead of decoding and re-encoding it
+    return Response(
+        content=client.get_saved_tracks_raw(limit=limit, offset=offset),
+        media_type="application/json",
+    )
+
+
+@router.get("/library", response_model=LibraryPage)
+def library(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Annotated[str | None, Query(description="next_cursor from the previous page")] = None,
+    state: Annotated[Literal["pending", "kept", "removed"] | None, Query()] = None,
+    artist: Annotated[str | None, Query(max_length=200)] = None,
+    album: Annotated[str | None, Query(max_length=200)] = None,
+    updated_from: Annotated[datetime | None, Query(description="Inclusive lower bound on updated_at")] = None,
+    updated_to: Annotated[datetime | None, Query(description="Exclusive upper bound on updated_at")] = None,
+) -> LibraryPage:
+    """Browse current user's tracks from our own DB (keyset-paginated, no Spotify calls)."""
+    try:
+        rows, next_cursor = list_library_page(
+            current_user,
+            db,
+            limit=limit,
+            cursor=cursor,
+            state=state,
+            artist=artist,
+            album=album,
+            updated_from=updated_from,
+            updated_to=updated_to,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    items = [
+        LibraryItem(
+            **TrackResponse.model_validate(track).model_dump(),
+            state=uts.state,
+            updated_at=uts.updated_at,
+        )
+        for track, uts in rows
+    ]
+    return LibraryPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/export")
+def export(
+    current_user: User = Depends(get_current_user),
+    format: Annotated[Literal["csv", "ndjson"], Query()] = "csv",
+    state: Annotated[Literal["pending", "kept", "removed"] | None, Query(description="Default: kept + removed")] = None,
+    gzip: Annotated[bool, Query()] = False,
+) -> StreamingResponse:
+    """Stream current user's swipe decisions as CSV or NDJSON (server-side cursor, flat memory)."""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"cur8-export.{format}"
+    if gzip:
+        # Served as a .gz file (not Content-Encoding) so browsers save it compressed
+        media_type = "application/gzip"
+        filename += ".gz"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    try:
+        export_db = open_export_session()
+    except sqlalchemy.exc.TimeoutError:
+        raise HTTPException(status_code=503, detail="Too many exports in progress", headers={"Retry-After": "10"})
+    return StreamingResponse(
+        stream_export(export_db, current_user.id, format, state=state, gzip=gzip),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@router.get("/{track_id}/artwork")
+def artwork(
+    track_id: UUID,
+    db: Session = Depends(get_db),
+    size: Annotated[int, Query(ge=16, le=640)] = 300,
+    v: Annotated[str | None, Query(max_length=16, description="source_version of artwork_url")] = None,
+) -> FileResponse:
+    """Serve a cached, resized album-art thumbnail (fetched from Spotify once)."""
+    track = db.get(Track, track_id)
+    if track is None:
+        raise HTTPException(404, "Track not found")
+    size = snap_size(size)
+    for _ in range(2):
+        try:
+            path = get_artwork_path(track, size)
+        except httpx.HTTPError:
+            raise HTTPException(status_code=502, detail="Failed to fetch artwork")
+        if path is None:
+            raise HTTPException(404, "No artwork")
+        try:
+            stat_result = os.stat(path)
+            break
+        except FileNotFoundError:
+            continue  # evicted between lookup and send: fetch again
+    else:
+        raise HTTPException(status_code=503, detail="Artwork cache busy; try again")
+    # FileResponse streams via sendfile where available (and sets ETag / Last-Modified)
+    return FileResponse(
+        path,
+        stat_result=stat_result,
+        media_type="image/jpeg",
+        headers={"Cache-Control": cache_control(track.artwork_url, v)},
+    )
+
+
+@router.get("/{track_id}/preview")
+def preview(
+    track_id: UUID,
+    db: Session = Depends(get_db),
+    v: Annotated[str | None, Query(max_length=16, description="source_version of preview_url")] = None,
+) -> FileResponse:
+    """Serve the track's 30s preview from local disk cache (supports Range requests)."""
+    track = db.get(Track, track_id)
+    if track is None:
+        raise HTTPException(404, "Track not found")
+    if not track.preview_url:
+        raise HTTPException(404, "No preview")
+    for _ in range(2):
+        try:
+            path = get_preview_path(track.preview_url)
+        except httpx.HTTPError:
+            raise HTTPException(status_code=502, detail="Failed to fetch preview")
+        try:
+            return preview_response(path, cache_control(track.preview_url, v))
+        except FileNotFoundError:
+            continue  # evicted between lookup and send: fetch again
+    raise HTTPException(status_code=503, detail="Preview cache busy; try again")
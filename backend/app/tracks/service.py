@@ -1,12 +1,43 @@
+import base64
+import random
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import func
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
+from app.analytics.event_log import record_event
 from app.models import Track, User, UserTrackState
+from app.redis_client import get_redis
 from app.spotify import SpotifyClient, get_valid_access_token
 
+UPCOMING_KEY_PREFIX = "upcoming:"
+UPCOMING_SIZE = 3  # tracks pre-picked per user so their previews can be warmed
+UPCOMING_TTL_SECONDS = 3600
+
+# Queue ordering modes → (sort key, descending); each has a partial index on pending rows
+QUEUE_ORDERS = {
+    "random": (UserTrackState.random_key, False),
+    "oldest_liked": (UserTrackState.added_at, False),
+    "newest_liked": (UserTrackState.added_at, True),
+    "artist": (UserTrackState.artist_sort, False),
+    "shortest": (UserTrackState.duration_ms, False),
+}
+DEFAULT_QUEUE_ORDER = "random"
+
+SWIPE_EVENT_KEY_PREFIX = "swipe_event:"
+SWIPE_EVENT_TTL_SECONDS = 7 * 24 * 3600  # how long a client may keep retrying an offline swipe
+SWIPE_EVENT_PROCESSING_TTL_SECONDS = 60  # claim lapses if the worker dies mid-swipe
+
+
+class SwipeError(ValueError):
+    """Swipe could not be applied; status_code is the HTTP status to report."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
 
 def _track_from_spotify_item(item: dict) -> dict:
     """Build Track fields from Spotify /me/tracks item."""
@@ -20,14 +51,32 @@ def _track_from_spotify_item(item: dict) -> dict:
         "artists": artists or None,
         "album_name": t.get("album", {}).get("name"),
         "artwork_url": artwork,
+        "artwork_images": [
+            {"url": i.get("url"), "width": i.get("width"), "height": i.get("height")} for i in images
+        ] or None,
         "preview_url": t.get("preview_url"),
         "duration_ms": t.get("duration_ms"),
     }
 
 
+def _sort_keys_from_spotify_item(item: dict, fields: dict) -> dict:
+    """Build UserTrackState sort keys (denormalized so each queue order is one index probe)."""
+    added_at = None
+    if item.get("added_at"):
+        # Spotify sends UTC ("...Z"); stored naive local like updated_at
+        added_at = datetime.fromisoformat(item["added_at"].replace("Z", "+00:00")).astimezone().replace(tzinfo=None)
+    first_artist = (fields["artists"] or "").split(",")[0].strip().lower()
+    return {
+        "added_at": added_at,
+        "artist_sort": first_artist or None,
+        "duration_ms": fields["duration_ms"],
+    }
+
+
 def sync_saved_tracks_for_user(user: User, db: Session, spotify_client: SpotifyClient, limit: int = 50) -> None:
     """Fetch from Spotify, upsert Track and UserTrackState (pending) for user."""
     offset = 0
+    new_track_ids: list[UUID] = []
     while True:
         data = spotify_client.get_saved_tracks(limit=limit, offset=offset)
         items = data.get("items") or []
@@ -36,7 +85,14 @@ def sync_saved_tracks_for_user(user: User, db: Session, spotify_client: SpotifyC
         for item in items:
             tid = item["track"]["id"]
             fields = _track_from_spotify_item(item)
-            track = db.query(Track).filter_by(spotify_track_id=tid).first()
+            # FOR KEY SHARE until commit: the orphan GC's FOR UPDATE SKIP LOCKED then skips this
+            # row instead of deleting it before our user_track_states row references it
+            track = (
+                db.query(Track)
+                .filter_by(spotify_track_id=tid)
+                .with_for_update(read=True, key_share=True)
+                .first()
+            )
             if track is None:
                 track = Track(**fields)
                 db.add(track)
@@ -45,23 +101,258 @@ def sync_saved_tracks_for_user(user: User, db: Session, spotify_client: SpotifyC
                 # Backfill preview_url and other fields from Spotify (e.g. after adding preview_url column)
                 for k, v in fields.items():
                     setattr(track, k, v)
+            sort_keys = _sort_keys_from_spotify_item(item, fields)
             state = db.query(UserTrackState).filter_by(user_id=user.id, track_id=track.id).first()
             if state is None:
-                state = UserTrackState(user_id=user.id, track_id=track.id, state="pending")
+                state = UserTrackState(
+                    user_id=user.id,
+                    track_id=track.id,
+                    state="pending",
+                    random_key=random.random(),
+                    **sort_keys,
+                )
                 db.add(state)
+                new_track_ids.append(track.id)
+            else:
+                for k, v in sort_keys.items():
+                    setattr(state, k, v)
         offset += len(items)
         if len(items) < limit:
             break
     db.commit()
+    for track_id in new_track_ids:
+        record_event(user.id, track_id, "synced")
     
 
-def get_next_track(user: User, db: Session) -> Track | None:
-    """Return next pending track for user (random order)."""
-    row = (
+def _pending_tracks_query(user: User, db: Session):
+    return (
         db.query(Track)
         .join(UserTrackState, (UserTrackState.track_id == Track.id) & (UserTrackState.user_id == user.id))
         .filter(UserTrackState.state == "pending")
-        .order_by(func.random())
-        .first()
     )
-    return row
\ No newline at end of file
+
+
+def _ordered_pending_query(user: User, db: Session, order: str):
+    """Pending tracks in queue order (served by the matching partial index)."""
+    column, descending = QUEUE_ORDERS[order]
+    if descending:
+        return _pending_tracks_query(user, db).order_by(column.desc(), UserTrackState.track_id.desc())
+    return _pending_tracks_query(user, db).order_by(column, UserTrackState.track_id)
+
+
+def _pick_pending_tracks(user: User, db: Session, order: str, limit: int, skip: list[UUID]) -> list[Track]:
+    """Return up to limit pending tracks in queue order, excluding skip.
+
+    "random" starts at a random point of the per-row random_key and wraps around,
+    so it is an index probe too (no ORDER BY random() over all pending rows).
+    """
+    q = _pending_tracks_query(user, db) if order == "random" else _ordered_pending_query(user, db, order)
+    if skip:
+        q = q.filter(Track.id.notin_(skip))
+    if order != "random":
+        return q.limit(limit).all()
+    start = random.random()
+    ordered = q.order_by(UserTrackState.random_key, UserTrackState.track_id)
+    rows = ordered.filter(UserTrackState.random_key >= start).limit(limit).all()
+    if len(rows) < limit:
+        rows += ordered.filter(UserTrackState.random_key < start).limit(limit - len(rows)).all()
+    return rows
+
+
+def _upcoming_key(user: User) -> str:
+    return f"{UPCOMING_KEY_PREFIX}{user.id}"
+
+
+def get_next_track(user: User, db: Session, order: str = DEFAULT_QUEUE_ORDER) -> Track | None:
+    """Return next pending track for user (read-only: repeated calls return the same track).
+
+    Deterministic orders are a single partial-index probe. "random" reads the head of
+    the user's upcoming queue without removing it (apply_swipe removes it), so a reload
+    doesn't skip a track; an empty queue gets a fresh random pick as its head.
+    """
+    if order != "random":
+        rows = _pick_pending_tracks(user, db, order, 1, [])
+        return rows[0] if rows else None
+    key = _upcoming_key(user)
+    redis_client = get_redis()
+    while (track_id := redis_client.lindex(key, 0)) is not None:
+        row = _pending_tracks_query(user, db).filter(Track.id == UUID(track_id)).first()
+        if row is not None:
+            return row
+        # Swiped (or gone) since it was queued
+        redis_client.lrem(key, 0, track_id)
+    rows = _pick_pending_tracks(user, db, "random", 1, [])
+    if not rows:
+        return None
+    with redis_client.pipeline() as pipe:
+        pipe.rpush(key, str(rows[0].id))
+        pipe.expire(key, UPCOMING_TTL_SECONDS)
+        pipe.execute()
+    return rows[0]
+
+
+def fill_upcoming_tracks(
+    user: User,
+    db: Session,
+    current: UUID,
+    order: str = DEFAULT_QUEUE_ORDER,
+) -> list[Track]:
+    """Return the UPCOMING_SIZE tracks that follow current, for preview warming.
+
+    Deterministic orders just probe the next rows in order (nothing stored). "random"
+    tops up the queue behind its head (current) and returns the newly queued tracks.
+    """
+    if order != "random":
+        return _pick_pending_tracks(user, db, order, UPCOMING_SIZE, [current])
+    key = _upcoming_key(user)
+    queued = [UUID(t) for t in get_redis().lrange(key, 0, -1)]
+    missing = UPCOMING_SIZE + 1 - len(queued)  # +1: the head is the current track
+    if missing <= 0:
+        return []
+    rows = _pick_pending_tracks(user, db, "random", missing, queued + [current])
+    if rows:
+        with get_redis().pipeline() as pipe:
+            pipe.rpush(key, *(str(t.id) for t in rows))
+            pipe.expire(key, UPCOMING_TTL_SECONDS)
+            pipe.execute()
+    return rows
+
+
+def encode_library_cursor(updated_at: datetime, track_id: UUID) -> str:
+    """Return opaque cursor (url-safe base64) for the last row of a library page."""
+    raw = f"{updated_at.isoformat()}|{track_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_library_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Parse cursor from encode_library_cursor; raise ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("utf-8")).decode("utf-8")
+        ts, tid = raw.split("|", 1)
+        return datetime.fromisoformat(ts), UUID(tid)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def list_library_page(
+    user: User,
+    db: Session,
+    limit: int = 50,
+    cursor: str | None = None,
+    state: str | None = None,
+    artist: str | None = None,
+    album: str | None = None,
+    updated_from: datetime | None = None,
+    updated_to: datetime | None = None,
+) -> tuple[list[tuple[Track, UserTrackState]], str | None]:
+    """Return one page of the user's local library (newest first) and the next cursor.
+
+    Keyset pagination on (updated_at, track_id): each page is an index range scan on
+    ix_user_track_states_user[_state]_updated, so cost doesn't grow with depth.
+    artist/album substring filters are served by the pg_trgm GIN indexes on tracks,
+    so a selective filter doesn't walk the user's whole updated_at index.
+    """
+    q = (
+        db.query(Track, UserTrackState)
+        .join(UserTrackState, UserTrackState.track_id == Track.id)
+        .filter(UserTrackState.user_id == user.id)
+        .filter(UserTrackState.updated_at.isnot(None))
+    )
+    if state is not None:
+        q = q.filter(UserTrackState.state == state)
+    if artist:
+        q = q.filter(Track.artists.ilike(f"%{_escape_like(artist)}%", escape="\\"))
+    if album:
+        q = q.filter(Track.album_name.ilike(f"%{_escape_like(album)}%", escape="\\"))
+    if updated_from is not None:
+        q = q.filter(UserTrackState.updated_at >= updated_from)
+    if updated_to is not None:
+        q = q.filter(UserTrackState.updated_at < updated_to)
+    if cursor:
+        cursor_ts, cursor_tid = decode_library_cursor(cursor)
+        q = q.filter(tuple_(UserTrackState.updated_at, UserTrackState.track_id) < tuple_(cursor_ts, cursor_tid))
+
+    # Fetch one extra row to know whether there is a next page
+    rows = (
+        q.order_by(UserTrackState.updated_at.desc(), UserTrackState.track_id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        _, last_state = rows[-1]
+        next_cursor = encode_library_cursor(last_state.updated_at, last_state.track_id)
+    return rows, next_cursor
+
+
+def claim_swipe_event(user_id: UUID, event_id: str) -> str | None:
+    """Claim event_id for processing (SET NX "processing").
+
+    Returns None if this call claimed it, else the existing status: "processing"
+    (another attempt is still running) or "done" (already applied).
+    """
+    key = f"{SWIPE_EVENT_KEY_PREFIX}{user_id}:{event_id}"
+    redis_client = get_redis()
+    if redis_client.set(key, "processing", nx=True, ex=SWIPE_EVENT_PROCESSING_TTL_SECONDS):
+        return None
+    # Key may lapse between SET and GET; treat as still in flight so the client retries
+    return redis_client.get(key) or "processing"
+
+
+def complete_swipe_event(user_id: UUID, event_id: str) -> None:
+    """Mark event_id as applied; retries now get "duplicate" for SWIPE_EVENT_TTL_SECONDS."""
+    get_redis().set(f"{SWIPE_EVENT_KEY_PREFIX}{user_id}:{event_id}", "done", ex=SWIPE_EVENT_TTL_SECONDS)
+
+
+def release_swipe_event(user_id: UUID, event_id: str) -> None:
+    """Forget event_id so a failed swipe can be retried."""
+    get_redis().delete(f"{SWIPE_EVENT_KEY_PREFIX}{user_id}:{event_id}")
+
+
+def apply_swipe(
+    user: User,
+    db: Session,
+    spotify_track_id: str,
+    action: str,
+    client_ts: datetime | None = None,
+) -> str:
+    """Set track state to kept/removed (removing from Spotify if needed); return "ok" or "duplicate".
+
+    Re-applying the same decision is a no-op ("duplicate"); a conflicting one raises SwipeError.
+    """
+    track = db.query(Track).filter_by(spotify_track_id=spotify_track_id).first()
+    if not track:
+        raise SwipeError(404, "Track not found")
+    state = db.query(UserTrackState).filter_by(user_id=user.id, track_id=track.id).first()
+    if not state:
+        raise SwipeError(400, "Track not pending")
+    new_state = "kept" if action == "keep" else "removed"
+    if state.state == new_state:
+        return "duplicate"
+    if state.state != "pending":
+        raise SwipeError(400, "Track not pending")
+    old_state = state.state
+    state.state = new_state
+    # Offline clients send when the swipe happened; never trust a future timestamp
+    now = datetime.now()
+    if client_ts is not None:
+        if client_ts.tzinfo is not None:
+            client_ts = client_ts.astimezone().replace(tzinfo=None)
+        state.updated_at = min(client_ts, now)
+    else:
+        state.updated_at = now
+    if action == "remove":
+        access_token = get_valid_access_token(user, db)
+        SpotifyClient(access_token).remove_saved_track(spotify_track_id)
+    db.commit()
+    # Decided: drop it from the random queue so /tracks/next moves on
+    get_redis().lrem(_upcoming_key(user), 0, str(track.id))
+    record_event(user.id, track.id, new_state, from_state=old_state, occurred_at=state.updated_at)
+    return "ok"
@@ -5,8 +5,9 @@ from sqlalchemy import pool
 
 from alembic import context
 
-# import app vars and settings
-from app.config import get_settings
+import os
+
+# import app vars (models only; engine/settings are lazy so no full .env is needed)
 from app.db import Base
 import app.models
 
@@ -14,9 +15,12 @@ import app.models
 # access to the values within the .ini file in use.
 config = context.config
 
-# load settings
-settings = get_settings()
-config.set_main_option("sqlalchemy.url", settings.database_url)
+# DATABASE_URL from env if set, else full app settings
+database_url = os.environ.get("DATABASE_URL")
+if not database_url:
+    from app.config import get_settings
+    database_url = get_settings().database_url
+config.set_main_option("sqlalchemy.url", database_url)
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
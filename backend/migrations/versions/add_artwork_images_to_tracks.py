@@ -0,0 +1,24 @@
+"""add artwork_images to tracks
+
+Revision ID: add_artwork_images
+Revises: add_library_keyset_indexes
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_artwork_images"
+down_revision: Union[str, Sequence[str], None] = "add_library_keyset_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tracks", sa.Column("artwork_images", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("tracks", "artwork_images")
@@ -0,0 +1,36 @@
+"""add keyset indexes on user_track_states for library browsing
+
+Revision ID: add_library_keyset_indexes
+Revises: add_preview_url
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_library_keyset_indexes"
+down_revision: Union[str, Sequence[str], None] = "add_preview_url"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cursor is (updated_at, track_id); backfill NULLs so every row is reachable by the cursor
+    op.execute("UPDATE user_track_states SET updated_at = now() WHERE updated_at IS NULL")
+    op.create_index(
+        "ix_user_track_states_user_updated",
+        "user_track_states",
+        ["user_id", "updated_at", "track_id"],
+    )
+    op.create_index(
+        "ix_user_track_states_user_state_updated",
+        "user_track_states",
+        ["user_id", "state", "updated_at", "track_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_track_states_user_state_updated", table_name="user_track_states")
+    op.drop_index("ix_user_track_states_user_updated", table_name="user_track_states")
@@ -0,0 +1,38 @@
+"""add pg_trgm GIN indexes on tracks.artists / tracks.album_name for library filters
+
+Revision ID: add_library_trgm_indexes
+Revises: add_queue_order_sort_keys
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "add_library_trgm_indexes"
+down_revision: Union[str, Sequence[str], None] = "add_queue_order_sort_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_tracks_artists_trgm",
+        "tracks",
+        ["artists"],
+        postgresql_using="gin",
+        postgresql_ops={"artists": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_tracks_album_name_trgm",
+        "tracks",
+        ["album_name"],
+        postgresql_using="gin",
+        postgresql_ops={"album_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tracks_album_name_trgm", table_name="tracks")
+    op.drop_index("ix_tracks_artists_trgm", table_name="tracks")
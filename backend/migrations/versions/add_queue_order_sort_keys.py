@@ -0,0 +1,56 @@
+"""add queue order sort keys to user_track_states, partial indexes, users.queue_order
+
+Revision ID: add_queue_order_sort_keys
+Revises: partition_user_track_states
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_queue_order_sort_keys"
+down_revision: Union[str, Sequence[str], None] = "partition_user_track_states"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_PENDING = sa.text("state = 'pending'")
+_INDEXES = {
+    "ix_uts_pending_random": "random_key",
+    "ix_uts_pending_added": "added_at",
+    "ix_uts_pending_artist": "artist_sort",
+    "ix_uts_pending_duration": "duration_ms",
+}
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("queue_order", sa.String(length=20), server_default="random", nullable=False))
+    op.add_column("user_track_states", sa.Column("added_at", sa.DateTime(), nullable=True))
+    op.add_column("user_track_states", sa.Column("artist_sort", sa.String(), nullable=True))
+    op.add_column("user_track_states", sa.Column("duration_ms", sa.Integer(), nullable=True))
+    op.add_column("user_track_states", sa.Column("random_key", sa.Float(), nullable=True))
+
+    # Backfill until the next sync writes real values (added_at ≈ when we first saw it)
+    op.execute("""
+        UPDATE user_track_states s SET
+            added_at = s.updated_at,
+            artist_sort = NULLIF(lower(trim(split_part(t.artists, ',', 1))), ''),
+            duration_ms = t.duration_ms,
+            random_key = random()
+        FROM tracks t
+        WHERE t.id = s.track_id
+    """)
+
+    for name, column in _INDEXES.items():
+        op.create_index(name, "user_track_states", ["user_id", column, "track_id"], postgresql_where=_PENDING)
+
+
+def downgrade() -> None:
+    for name in _INDEXES:
+        op.drop_index(name, table_name="user_track_states")
+    op.drop_column("user_track_states", "random_key")
+    op.drop_column("user_track_states", "duration_ms")
+    op.drop_column("user_track_states", "artist_sort")
+    op.drop_column("user_track_states", "added_at")
+    op.drop_column("users", "queue_order")
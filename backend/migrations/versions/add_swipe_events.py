@@ -0,0 +1,63 @@
+"""add partitioned swipe_events log and swipe_event_daily rollup
+
+Revision ID: add_swipe_events
+Revises: add_artwork_images
+Create Date: 2026-10-19
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "add_swipe_events"
+down_revision: Union[str, Sequence[str], None] = "add_artwork_images"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month_start(d: date, offset: int) -> date:
+    m = d.month - 1 + offset
+    return date(d.year + m // 12, m % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "swipe_events",
+        # BIGSERIAL (not IDENTITY: unsupported on partitioned tables before PG 17)
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("track_id", sa.UUID(), nullable=False),
+        sa.Column("event_type", sa.String(length=20), nullable=False),
+        sa.Column("from_state", sa.String(length=20), nullable=True),
+        sa.PrimaryKeyConstraint("id", "occurred_at"),
+        postgresql_partition_by="RANGE (occurred_at)",
+    )
+    op.create_index("ix_swipe_events_user_occurred", "swipe_events", ["user_id", "occurred_at"])
+    # Catch-all partition plus this and next month; the rollup job keeps creating months ahead
+    op.execute("CREATE TABLE swipe_events_default PARTITION OF swipe_events DEFAULT")
+    today = date.today()
+    for offset in (0, 1):
+        start, end = _month_start(today, offset), _month_start(today, offset + 1)
+        op.execute(
+            f"CREATE TABLE swipe_events_{start:%Y%m} PARTITION OF swipe_events "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+
+    op.create_table(
+        "swipe_event_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("event_type", sa.String(length=20), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("avg_decision_seconds", sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint("day", "user_id", "event_type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("swipe_event_daily")
+    # Dropping the parent drops all partitions
+    op.drop_table("swipe_events")
@@ -0,0 +1,91 @@
+"""partition user_track_states by state (pending hot / decided cold); index track_id for GC
+
+Revision ID: partition_user_track_states
+Revises: add_swipe_events
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "partition_user_track_states"
+down_revision: Union[str, Sequence[str], None] = "add_swipe_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_INDEXES = """
+CREATE INDEX ix_user_track_states_user_updated ON user_track_states (user_id, updated_at, track_id);
+CREATE INDEX ix_user_track_states_user_state_updated ON user_track_states (user_id, state, updated_at, track_id);
+CREATE INDEX ix_user_track_states_track_id ON user_track_states (track_id);
+"""
+
+
+def upgrade() -> None:
+    # Move the plain table aside (index names are schema-global, so rename them too)
+    op.execute("ALTER TABLE user_track_states RENAME TO user_track_states_old")
+    op.execute("ALTER INDEX user_track_states_pkey RENAME TO user_track_states_old_pkey")
+    op.execute("ALTER INDEX ix_user_track_states_user_updated RENAME TO ix_user_track_states_old_user_updated")
+    op.execute(
+        "ALTER INDEX ix_user_track_states_user_state_updated "
+        "RENAME TO ix_user_track_states_old_user_state_updated"
+    )
+
+    # Partition key must be part of the PK; a state change moves the row between partitions
+    op.execute("""
+        CREATE TABLE user_track_states (
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            track_id UUID NOT NULL REFERENCES tracks (id) ON DELETE CASCADE,
+            state VARCHAR(20) NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (user_id, track_id, state)
+        ) PARTITION BY LIST (state)
+    """)
+    op.execute("CREATE TABLE user_track_states_pending PARTITION OF user_track_states FOR VALUES IN ('pending')")
+    op.execute("CREATE TABLE user_track_states_decided PARTITION OF user_track_states DEFAULT")
+    # Per-partition uniqueness on (user_id, track_id) for the decided side
+    op.execute(
+        "CREATE UNIQUE INDEX ux_user_track_states_decided_user_track "
+        "ON user_track_states_decided (user_id, track_id)"
+    )
+
+    op.execute("""
+        INSERT INTO user_track_states (user_id, track_id, state, updated_at)
+        SELECT user_id, track_id, state, updated_at FROM user_track_states_old
+    """)
+    op.execute("DROP TABLE user_track_states_old")
+    op.execute(_INDEXES)
+    op.execute("ANALYZE user_track_states")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE user_track_states RENAME TO user_track_states_part")
+    op.execute("ALTER INDEX user_track_states_pkey RENAME TO user_track_states_part_pkey")
+    op.execute("DROP INDEX ix_user_track_states_user_updated")
+    op.execute("DROP INDEX ix_user_track_states_user_state_updated")
+    op.execute("DROP INDEX ix_user_track_states_track_id")
+
+    op.execute("""
+        CREATE TABLE user_track_states (
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            track_id UUID NOT NULL REFERENCES tracks (id) ON DELETE CASCADE,
+            state VARCHAR(20) NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (user_id, track_id)
+        )
+    """)
+    op.execute("""
+        INSERT INTO user_track_states (user_id, track_id, state, updated_at)
+        SELECT DISTINCT ON (user_id, track_id) user_id, track_id, state, updated_at
+        FROM user_track_states_part
+        ORDER BY user_id, track_id, updated_at DESC NULLS LAST
+    """)
+    op.execute("DROP TABLE user_track_states_part")
+    op.execute(
+        "CREATE INDEX ix_user_track_states_user_updated "
+        "ON user_track_states (user_id, updated_at, track_id)"
+    )
+    op.execute(
+        "CREATE INDEX ix_user_track_states_user_state_updated "
+        "ON user_track_states (user_id, state, updated_at, track_id)"
+    )
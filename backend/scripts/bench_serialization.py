@@ -0,0 +1,66 @@
+"""Microbenchmark: per-request cost of serializing a /tracks/next payload.
+
+Compares the old path (TrackResponse from attributes + stdlib JSON), the
+ORJSONResponse path, and direct encoding via app.tracks.payloads.
+No DB or .env needed. Run from backend/:
+    python scripts/bench_serialization.py [--n 100000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import uuid
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.tracks.payloads import track_payload  # noqa: E402
+from app.tracks.routes import TrackResponse  # noqa: E402
+
+
+def fake_track() -> SimpleNamespace:
+    """Stand-in for a Track ORM row with realistic field sizes."""
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        spotify_track_id="4uLU6hMCjMI75M1A2tKUQC",
+        name="Never Gonna Give You Up",
+        artists="Rick Astley",
+        album_name="Whenever You Need Somebody",
+        artwork_url="https://i.scdn.co/image/ab67616d0000b273baf89eb11ec7c657805d2da0",
+        preview_url="https://p.scdn.co/mp3-preview/b4c682084c3fd05538726d0a126b7e14b6e92c83",
+        duration_ms=213573,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100_000)
+    args = parser.parse_args()
+
+    track = fake_track()
+
+    def stdlib_path() -> bytes:
+        model = TrackResponse.model_validate(track)
+        return json.dumps(jsonable_encoder(model)).encode("utf-8")
+
+    def orjson_path() -> bytes:
+        return orjson.dumps(TrackResponse.model_validate(track).model_dump(mode="json"))
+
+    def direct_path() -> bytes:
+        return track_payload(track, TrackResponse)
+
+    # Same wire format in every path
+    assert orjson.loads(stdlib_path()) == orjson.loads(orjson_path()) == orjson.loads(direct_path())
+
+    for name, fn in (("pydantic + json", stdlib_path), ("pydantic + orjson", orjson_path), ("direct orjson", direct_path)):
+        seconds = min(timeit.repeat(fn, number=args.n, repeat=3))
+        print(f"{name:20s} {seconds / args.n * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Startup benchmark: import cost of app modules and time to first /health 200.
+
+Run from backend/:
+    python scripts/bench_startup.py                 # both measurements
+    python scripts/bench_startup.py --top 30        # show 30 slowest imports
+    python scripts/bench_startup.py --skip-server   # import times only
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str, top: int) -> None:
+    """Print total and slowest cumulative imports from `python -X importtime`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cum_us, name = [p.strip() for p in line.replace("import time:", "|").split("|")]
+        rows.append((int(cum_us), int(self_us), name.strip()))
+    if proc.returncode != 0:
+        print(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+        return
+    total = max((cum for cum, _, name in rows if name == module), default=0)
+    print(f"import {module}: {total / 1000:.1f} ms cumulative")
+    for cum, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cum / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+
+def time_to_health(port: int, timeout: float) -> None:
+    """Start uvicorn and measure wall time until GET /health returns 200."""
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                print(f"uvicorn exited early (code {proc.returncode})")
+                return
+            try:
+                with urllib.request.urlopen(url, timeout=1) as r:
+                    if r.status == 200:
+                        print(f"time to first /health 200: {(time.perf_counter() - start) * 1000:.0f} ms")
+                        return
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.02)
+        print(f"/health not ready after {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--skip-server", action="store_true")
+    args = parser.parse_args()
+
+    import_times(args.module, args.top)
+    if not args.skip_server:
+        time_to_health(args.port, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
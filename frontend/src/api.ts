@@ -1,11 +1,14 @@
 const raw = import.meta.env.VITE_API_URL ?? ''
 const API_URL = raw.startsWith('http://') || raw.startsWith('https://') ? raw : `https://${raw}`
 
+export type QueueOrder = 'random' | 'oldest_liked' | 'newest_liked' | 'artist' | 'shortest';
+
 export interface User {
     id: string;
     spotify_user_id: string;
     display_name: string | null;
     avatar_url: string | null;
+    queue_order: QueueOrder;
 }
 
 export interface Track {
@@ -19,6 +22,36 @@ export interface Track {
   duration_ms: number | null;
 }
 
+/** 32-bit FNV-1a of a source URL as 8 hex chars (matches backend app/media/versioning.py). */
+function sourceVersion(url: string): string {
+    let h = 0x811c9dc5;
+    for (const b of new TextEncoder().encode(url)) {
+        h = Math.imul(h ^ b, 0x01000193);
+    }
+    return (h >>> 0).toString(16).padStart(8, "0");
+}
+
+/** Backend-cached thumbnail for a track; versioned by source URL so it can be cached forever. */
+export function artworkUrl(track: Track, size = 300): string {
+    const v = track.artwork_url ? `&v=${sourceVersion(track.artwork_url)}` : "";
+    return `${API_URL}/tracks/${track.id}/artwork?size=${size}${v}`;
+}
+
+/** Backend-cached preview clip (local disk, Range-capable), versioned like artworkUrl. */
+export function previewUrl(track: Track): string {
+    const v = track.preview_url ? `?v=${sourceVersion(track.preview_url)}` : "";
+    return `${API_URL}/tracks/${track.id}/preview${v}`;
+}
+
+export class ApiError extends Error {
+    status: number;
+
+    constructor(message: string, status: number) {
+        super(message);
+        this.status = status;
+    }
+}
+
 async function request<T>(
     path: string,
     options: RequestInit = {}
@@ -33,7 +66,7 @@ async function request<T>(
     });
     if (!res.ok) {
         const body = await res.json().catch(() => ({}));
-        throw new Error((body as { detail?: string }).detail ?? res.statusText);
+        throw new ApiError((body as { detail?: string }).detail ?? res.statusText, res.status);
     }
     if (res.status === 204) return undefined as T;
     return res.json();
@@ -55,12 +88,51 @@ export async function getNextTrack(): Promise<Track | null> {
     return request<Track | null>('/tracks/next');
 }
 
-export async function swipe(
-    spotifyTrackId: string,
-    action: 'keep' | 'remove'
-): Promise<{ status: string }> {
-    return request<{ status: string }>('/tracks/swipe', {
-        method: 'POST',
-        body: JSON.stringify({ spotify_track_id: spotifyTrackId, action }),
+export async function setQueueOrder(order: QueueOrder): Promise<{ order: QueueOrder }> {
+    return request<{ order: QueueOrder }>('/tracks/order', {
+        method: 'PUT',
+        body: JSON.stringify({ order }),
     });
 }
+
+export interface PendingSwipe {
+    spotifyTrackId: string;
+    action: 'keep' | 'remove';
+    eventId: string;
+    clientTs: string;
+}
+
+/** Create a swipe with its idempotency key; keep it until the backend confirms it. */
+export function newSwipe(spotifyTrackId: string, action: 'keep' | 'remove'): PendingSwipe {
+    return { spotifyTrackId, action, eventId: crypto.randomUUID(), clientTs: new Date().toISOString() };
+}
+
+const SWIPE_RETRY_DELAYS_MS = [500, 1500, 4000];
+
+function isRetryable(e: unknown): boolean {
+    // Network failure (fetch TypeError), in-flight duplicate (409) or server error
+    return !(e instanceof ApiError) || e.status === 409 || e.status >= 500;
+}
+
+/** Send a swipe, retrying with the same event_id so the backend dedups it. */
+export async function swipe(pending: PendingSwipe): Promise<{ status: string; duplicate: boolean }> {
+    const send = () =>
+        request<{ status: string; duplicate: boolean }>('/tracks/swipe', {
+            method: 'POST',
+            body: JSON.stringify({
+                spotify_track_id: pending.spotifyTrackId,
+                action: pending.action,
+                event_id: pending.eventId,
+                client_ts: pending.clientTs,
+            }),
+        });
+    for (const delay of SWIPE_RETRY_DELAYS_MS) {
+        try {
+            return await send();
+        } catch (e) {
+            if (!isRetryable(e)) throw e;
+            await new Promise((resolve) => setTimeout(resolve, delay));
+        }
+    }
+    return send();
+}
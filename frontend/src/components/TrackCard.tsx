@@ -1,5 +1,5 @@
 import { useMotionValue, useTransform, motion } from 'framer-motion';
-import type { Track } from '../api';
+import { artworkUrl, previewUrl, type Track } from '../api';
 
 const SWIPE_THRESHOLD = 80;
 const VELOCITY_THRESHOLD = 400;
@@ -56,7 +56,7 @@ export function TrackCard({ track, exitDirection, onSwipe }: TrackCardProps) {
       onDragEnd={onSwipe ? handleDragEnd : undefined}
     >
       {track.artwork_url && (
-        <img src={track.artwork_url} alt="" className="track-card__artwork" />
+        <img src={artworkUrl(track)} alt="" className="track-card__artwork" />
       )}
       <h2 className="track-card__name">{track.name}</h2>
       {track.artists && <p className="track-card__artists">{track.artists}</p>}
@@ -65,7 +65,7 @@ export function TrackCard({ track, exitDirection, onSwipe }: TrackCardProps) {
         {track.preview_url ? (
           <>
             <span className="track-card__preview-label">Preview</span>
-            <audio src={track.preview_url} controls className="track-card__preview" />
+            <audio src={previewUrl(track)} controls className="track-card__preview" />
           </>
         ) : (
           <span className="track-card__preview-unavailable">No preview</span>
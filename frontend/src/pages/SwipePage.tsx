@@ -1,6 +1,6 @@
 import { useCallback, useEffect, useRef, useState } from 'react';
 import { AnimatePresence, motion } from 'framer-motion';
-import { getNextTrack, swipe, type Track } from '../api';
+import { getNextTrack, newSwipe, swipe, type PendingSwipe, type Track } from '../api';
 import { useAuth } from '../contexts/AuthContext';
 import { TrackCard } from '../components/TrackCard';
 
@@ -10,7 +10,7 @@ export function SwipePage() {
   const [exitingTrack, setExitingTrack] = useState<{ track: Track; action: 'keep' | 'remove' } | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
-  const exitingRef = useRef<{ track: Track; action: 'keep' | 'remove' } | null>(null);
+  const exitingRef = useRef<{ track: Track; action: 'keep' | 'remove'; pending: PendingSwipe } | null>(null);
 
   const loadNext = useCallback(async () => {
     setLoading(true);
@@ -33,7 +33,8 @@ export function SwipePage() {
   const handleSwipe = useCallback(
     (action: 'keep' | 'remove') => {
       if (!track) return;
-      exitingRef.current = { track, action };
+      // Event id is fixed here so every retry of this swipe reuses it
+      exitingRef.current = { track, action, pending: newSwipe(track.spotify_track_id, action) };
       setExitingTrack({ track, action });
       // Don't clear track yet - next render gives card exitDirection, then useEffect clears it
     },
@@ -50,7 +51,7 @@ export function SwipePage() {
   const handleExitComplete = useCallback(() => {
     const pending = exitingRef.current;
     if (!pending) return;
-    swipe(pending.track.spotify_track_id, pending.action)
+    swipe(pending.pending)
       .then(() => {
         setExitingTrack(null);
         exitingRef.current = null;